@@ -0,0 +1,22 @@
+"""
+Shared pytest setup
+
+Loads .env and records whether a live LiteLLM server is configured, then
+fills in placeholder settings so server can still be imported by the
+offline tests, which never leave the process.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LIVE_SERVER_CONFIGURED = bool(
+    os.getenv("LITELLM_API_KEY") and os.getenv("LITELLM_VECTOR_STORE_ID")
+)
+
+# Empty values (e.g. LITELLM_API_KEY= in .env) count as unset
+for name, placeholder in [("LITELLM_API_KEY", "sk-test"), ("LITELLM_VECTOR_STORE_ID", "1000")]:
+    if not os.getenv(name):
+        os.environ[name] = placeholder
@@ -6,30 +6,58 @@ A Model Context Protocol server that enables Claude to search your LiteLLM vecto
 for relevant code and documentation with semantic search capabilities.
 """
 
-import json
+import asyncio
+import functools
+import hashlib
+import math
+import operator
 import os
+import re
+import sqlite3
 import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, closing
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict
+
+# orjson is an optional speedup; fall back to the standard library without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize the MCP server with proper naming convention
-mcp = FastMCP("litellm_vector_store_mcp")
-
 # Constants
 CHARACTER_LIMIT = 25000  # Maximum response size in characters
+MAX_CONTENT_LENGTH = 2000  # Maximum characters shown per result snippet
+HEADER_RESERVE = 1000  # Characters kept free for the response header
+STORES_PAGE_SIZE = 100  # Vector stores fetched per list request
+MAX_BATCH_SEARCHES = 10  # Maximum searches per batch tool call
 API_BASE_URL = os.getenv("LITELLM_BASE_URL", "https://litellm.psolabs.com")
 API_KEY = os.getenv("LITELLM_API_KEY")
 VECTOR_STORE_ID = os.getenv("LITELLM_VECTOR_STORE_ID")
 VERTEX_AI_PROJECT = os.getenv("VERTEX_AI_PROJECT")
 VERTEX_AI_LOCATION = os.getenv("VERTEX_AI_LOCATION", "us-east4")
+STORES_CACHE_TTL = float(os.getenv("LITELLM_STORE_CACHE_TTL", "300"))  # Seconds
+STORES_MISS_REFRESH_INTERVAL = 30.0  # Seconds; unknown names within this don't refetch
+RESULT_CACHE_TTL = float(os.getenv("LITELLM_RESULT_TTL", "300"))  # Seconds
+RESULT_CACHE_SIZE = 256  # Maximum number of cached searches
+EMBEDDING_MODEL = os.getenv("LITELLM_EMBEDDING_MODEL")  # Enables the semantic cache
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("LITELLM_SEMANTIC_CACHE_THRESHOLD", "0.85"))
+EMBEDDING_TIMEOUT = 5.0  # Seconds; a slow embedding shouldn't hold up the search
+EMBEDDING_CACHE_DIR = os.getenv("LITELLM_EMBEDDING_CACHE_DIR")  # Persists embeddings across runs
+EMBEDDING_CACHE_SIZE = 4096  # Maximum number of embeddings kept in memory
+EMBEDDING_CACHE_TTL = 86400  # Seconds
 
 # Validate required environment variables on startup
 if not API_KEY:
@@ -48,6 +76,72 @@ if not VECTOR_STORE_ID:
     )
     sys.exit(1)
 
+# Shared HTTP client so every tool call reuses pooled keep-alive connections
+# instead of paying a fresh TCP+TLS handshake per request
+_HTTP_CLIENT = httpx.AsyncClient(
+    base_url=API_BASE_URL,
+    timeout=30.0,
+    headers={"Authorization": f"Bearer {API_KEY}"},
+    limits=httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=30.0,
+    ),
+    http2=True,  # Multiplex concurrent tool calls over one connection
+)
+
+# Direct vector store IDs: numeric, optionally with a "vs_" prefix
+_VECTOR_STORE_ID_RE = re.compile(r"(?:vs_)?\d+", re.ASCII)
+
+# Search request fields that are fixed for the lifetime of the process
+_BASE_SEARCH_BODY: Dict[str, Any] = {"custom_llm_provider": "vertex_ai"}
+
+# Add optional Vertex AI configuration if provided
+if VERTEX_AI_PROJECT:
+    _BASE_SEARCH_BODY["vertex_ai_project"] = VERTEX_AI_PROJECT
+if VERTEX_AI_LOCATION:
+    _BASE_SEARCH_BODY["vertex_ai_location"] = VERTEX_AI_LOCATION
+
+# Vector store catalogue cache: (fetched_at, stores, name -> id)
+_STORES_CACHE: Optional[Tuple[float, List[Dict[str, Any]], Dict[str, str]]] = None
+_STORES_LOCK = asyncio.Lock()  # Coalesces concurrent refreshes into one request
+_STORES_REFRESH_TASK: Optional["asyncio.Task[Any]"] = None  # Background refresh in flight
+_INFLIGHT_SEARCHES: Dict[Tuple[str, str, int], "asyncio.Task[List[Dict[str, Any]]]"] = {}
+
+
+async def _warmup() -> None:
+    """Open a pooled connection and prime the store catalogue cache.
+
+    This is best-effort, so any failure is ignored here; it surfaces with a
+    helpful message on the first tool call instead.
+    """
+    try:
+        await _load_store_catalogue()
+    except Exception:
+        pass
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Warm up the shared HTTP client on startup and close it on shutdown."""
+    # Run in the background so a slow LiteLLM server doesn't delay startup
+    warmup = asyncio.create_task(_warmup())
+    try:
+        yield
+    finally:
+        # Stop background catalogue work before the client it uses is closed
+        tasks = [warmup]
+        if _STORES_REFRESH_TASK is not None:
+            tasks.append(_STORES_REFRESH_TASK)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await _HTTP_CLIENT.aclose()
+
+
+# Initialize the MCP server with proper naming convention
+mcp = FastMCP("litellm_vector_store_mcp", lifespan=_lifespan)
+
 
 # Enums
 class ResponseFormat(str, Enum):
@@ -62,8 +156,8 @@ class VectorStoreSearchInput(BaseModel):
     """Input model for vector store search operations."""
 
     model_config = ConfigDict(
-        str_strip_whitespace=True,  # Auto-strip whitespace from strings
-        validate_assignment=True,  # Validate on assignment
+        str_strip_whitespace=True,  # Auto-strip whitespace; min_length rejects blank queries
+        frozen=True,  # Inputs are never mutated, so skip assignment validation
         extra="forbid",  # Forbid extra fields
     )
 
@@ -109,19 +203,352 @@ class VectorStoreSearchInput(BaseModel):
         ),
     )
 
-    @field_validator("query")
-    @classmethod
-    def validate_query(cls, v: str) -> str:
-        """Validate and clean the search query."""
-        if not v.strip():
-            raise ValueError("Query cannot be empty or whitespace only")
-        return v.strip()
+    preview_chars: Optional[int] = Field(
+        default=None,
+        description=(
+            "Return at most this many characters of content per result, for "
+            "previews that don't need the full snippet (default: full content "
+            "in JSON, 2000 characters in Markdown)"
+        ),
+        ge=1,
+    )
+
+    no_cache: bool = Field(
+        default=False,
+        description=(
+            "Bypass the search result cache and always query the vector store. "
+            "Results of this search are not cached either."
+        ),
+    )
+
+
+# Caches
+class QueryCache:
+    """LRU cache of search results with per-entry expiry.
+
+    Entries are keyed by (vector store ID, normalized query, max_results) and
+    hold the raw result list, so one entry serves every response format.
+    Access is guarded by a lock, making the cache safe to share across threads.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid; 0 or less disables caching
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[str, str, int], Tuple[float, List[Dict[str, Any]]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, int]) -> Optional[List[Dict[str, Any]]]:
+        """Return cached search results for a key, or None if missing or expired.
+
+        Args:
+            key: Tuple of (vector store ID, normalized query, max_results)
+
+        Returns:
+            Cached list of search result dictionaries, or None on a cache miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(
+        self,
+        key: Tuple[str, str, int],
+        results: List[Dict[str, Any]],
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        """Store search results, evicting the least recently used entries.
+
+        Args:
+            key: Tuple of (vector store ID, normalized query, max_results)
+            results: List of search result dictionaries to cache
+            fetched_at: time.monotonic() when the results were fetched upstream;
+                defaults to now. Reused results keep their original age this way
+        """
+        if self.ttl <= 0:
+            return
+
+        if fetched_at is None:
+            fetched_at = time.monotonic()
+        with self._lock:
+            self._entries[key] = (fetched_at, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, vector_store_id: str) -> None:
+        """Drop every cached search for a vector store.
+
+        Args:
+            vector_store_id: ID of the vector store whose contents changed
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == vector_store_id]:
+                del self._entries[key]
+
+
+class SemanticCache:
+    """Cache of search results matched by query embedding similarity.
+
+    Lets paraphrased queries ("Redis config" vs "Redis configuration") reuse a
+    recent search of the same store. Embeddings are stored unit-normalized, so
+    cosine similarity is a plain dot product. The oldest entries are dropped
+    once max_size is reached.
+    """
+
+    def __init__(self, max_size: int, ttl: float, threshold: float) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+            ttl: Seconds an entry stays valid; 0 or less disables caching
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.ttl = ttl
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._entries: deque[Tuple[float, str, int, List[float], List[Dict[str, Any]]]] = deque(
+            maxlen=max_size
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self, vector_store_id: str, max_results: int, embedding: List[float]
+    ) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """Return the results of the most similar cached search, if similar enough.
+
+        Args:
+            vector_store_id: ID of the vector store being searched
+            max_results: Maximum number of results requested
+            embedding: Unit-normalized embedding of the query
+
+        Returns:
+            Tuple of (time.monotonic() when the results were fetched, list of
+            search result dictionaries), or None on a cache miss
+        """
+        now = time.monotonic()
+        best_score, best = self.threshold, None
+
+        with self._lock:
+            for fetched_at, store_id, count, vector, results in self._entries:
+                if store_id != vector_store_id or count != max_results:
+                    continue
+                if now - fetched_at >= self.ttl:
+                    continue
+                score = sum(map(operator.mul, vector, embedding))
+                if score >= best_score:
+                    best_score, best = score, (fetched_at, results)
+
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return best
+
+    def set(
+        self,
+        vector_store_id: str,
+        max_results: int,
+        embedding: List[float],
+        results: List[Dict[str, Any]],
+    ) -> None:
+        """Store search results under a query embedding.
+
+        Args:
+            vector_store_id: ID of the vector store that was searched
+            max_results: Maximum number of results requested
+            embedding: Unit-normalized embedding of the query
+            results: List of search result dictionaries to cache
+        """
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries.append(
+                (time.monotonic(), vector_store_id, max_results, embedding, results)
+            )
+
+    def invalidate(self, vector_store_id: str) -> None:
+        """Drop every cached search for a vector store.
+
+        Args:
+            vector_store_id: ID of the vector store whose contents changed
+        """
+        with self._lock:
+            kept = [entry for entry in self._entries if entry[1] != vector_store_id]
+            self._entries.clear()
+            self._entries.extend(kept)
+
+
+class EmbeddingCache:
+    """LRU cache of query embeddings, optionally persisted to disk.
+
+    Entries are keyed by (embedding model, query text). When a directory is
+    given, embeddings are also written to a SQLite database there, so repeat
+    queries skip the embedding request on later runs. Rows are keyed by a
+    hash of the model and text, so query text is never written to disk, and
+    vectors are stored as JSON. Disk access is blocking and runs in a worker
+    thread. Timestamps are wall-clock so they remain valid across restarts.
+    """
+
+    def __init__(self, max_size: int, ttl: float, directory: Optional[str] = None) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_size: Maximum number of in-memory entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid; 0 or less disables caching
+            directory: Directory for the persistent SQLite database, or None to keep it in memory only
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[str, str], Tuple[float, List[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._path = os.path.join(directory, "embeddings.sqlite3") if directory else None
+
+    async def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Return a cached embedding, checking memory first and then disk.
+
+        Args:
+            model: Embedding model name
+            text: Text that was embedded
+
+        Returns:
+            Cached unit-normalized embedding, or None on a cache miss
+        """
+        key = (model, text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] >= self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        if self._path is not None:
+            entry = await asyncio.to_thread(self._load, key)
+            if entry is not None:
+                self.hits += 1
+                self._remember(key, entry)
+                return entry[1]
+
+        self.misses += 1
+        return None
+
+    async def set(self, model: str, text: str, embedding: List[float]) -> None:
+        """Store an embedding in memory and, if enabled, on disk.
+
+        Args:
+            model: Embedding model name
+            text: Text that was embedded
+            embedding: Unit-normalized embedding to cache
+        """
+        if self.ttl <= 0:
+            return
+
+        key = (model, text)
+        entry = (time.time(), embedding)
+        self._remember(key, entry)
+        if self._path is not None:
+            await asyncio.to_thread(self._store, key, entry)
+
+    def _remember(self, key: Tuple[str, str], entry: Tuple[float, List[float]]) -> None:
+        """Add an entry to the in-memory LRU, evicting the oldest if full."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _digest(key: Tuple[str, str]) -> str:
+        """Hash a (model, text) key for use as a database row key."""
+        return hashlib.sha256("\0".join(key).encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating it and its table if needed."""
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        # SQLite locks the file itself, so several server processes can share it
+        conn = sqlite3.connect(self._path, timeout=5.0)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, created REAL NOT NULL, vector TEXT NOT NULL)"
+        )
+        return conn
+
+    def _load(self, key: Tuple[str, str]) -> Optional[Tuple[float, List[float]]]:
+        """Read an unexpired entry from disk; any disk or decode error counts as a miss."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT created, vector FROM embeddings WHERE key = ? AND created > ?",
+                    (self._digest(key), time.time() - self.ttl),
+                ).fetchone()
+            if row is None:
+                return None
+            vector = _loads_json(row[1])
+        except (OSError, sqlite3.Error, ValueError):
+            # The database is unreadable or the row is damaged
+            return None
+
+        if not isinstance(vector, list):
+            return None
+        return row[0], vector
+
+    def _store(self, key: Tuple[str, str], entry: Tuple[float, List[float]]) -> None:
+        """Write an entry to disk and prune expired ones; disk errors are ignored."""
+        created, vector = entry
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, created, vector) VALUES (?, ?, ?)",
+                    (self._digest(key), created, _dumps_json(vector, pretty=False)),
+                )
+                conn.execute(
+                    "DELETE FROM embeddings WHERE created <= ?", (created - self.ttl,)
+                )
+        except (OSError, sqlite3.Error):
+            # Persistence is best-effort; the in-memory entry still serves this run
+            pass
+
+
+_RESULT_CACHE = QueryCache(max_size=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+_SEMANTIC_CACHE = SemanticCache(
+    max_size=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL, threshold=SEMANTIC_CACHE_THRESHOLD
+)
+_EMBEDDING_CACHE = EmbeddingCache(
+    max_size=EMBEDDING_CACHE_SIZE, ttl=EMBEDDING_CACHE_TTL, directory=EMBEDDING_CACHE_DIR
+)
 
 
 # Shared utility functions
-async def _list_vector_stores() -> List[Dict[str, Any]]:
+async def _fetch_vector_stores() -> List[Dict[str, Any]]:
     """Fetch list of all available vector stores from LiteLLM.
 
+    Stores are requested STORES_PAGE_SIZE at a time, following further pages
+    only when the server reports more than one.
+
     Returns:
         List of vector store dictionaries with id, name, description, etc.
 
@@ -129,24 +556,139 @@ async def _list_vector_stores() -> List[Dict[str, Any]]:
         httpx.HTTPStatusError: If the API request fails
         httpx.TimeoutException: If the request times out
     """
-    url = f"{API_BASE_URL}/vector_store/list"
-
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-    }
+    stores: List[Dict[str, Any]] = []
+    page = 1
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, headers=headers)
+    while True:
+        response = await _HTTP_CLIENT.get(
+            "/vector_store/list",
+            params={"page": page, "page_size": STORES_PAGE_SIZE},
+        )
         response.raise_for_status()
-        data = response.json()
-        return data.get("data", [])
+        data = _loads_json(response.content)
+
+        page_stores = data.get("data", [])
+        stores.extend(page_stores)
+
+        # Stop on the last page, or if the server doesn't paginate at all
+        if not page_stores or page >= data.get("total_pages", 1):
+            return stores
+        page += 1
+
+
+async def _refresh_store_catalogue() -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Fetch the vector store list and rebuild the cached catalogue.
+
+    Concurrent callers share a single refresh request. Cached search results
+    for stores whose updated_at changed, or that disappeared, are invalidated.
+
+    Returns:
+        Tuple of (list of vector store dictionaries, mapping of name to ID)
+
+    Raises:
+        httpx.HTTPStatusError: If the API request fails
+        httpx.TimeoutException: If the request times out
+    """
+    global _STORES_CACHE
+
+    started = time.monotonic()
+    async with _STORES_LOCK:
+        # Another caller may have refreshed the cache while we waited
+        cached = _STORES_CACHE
+        if cached is not None and cached[0] >= started:
+            return cached[1], cached[2]
+
+        stores = await _fetch_vector_stores()
+        name_to_id = {
+            store["vector_store_name"]: store["vector_store_id"]
+            for store in stores
+            if store.get("vector_store_name")
+        }
+
+        # Drop cached searches for stores that were updated or removed
+        if cached is not None:
+            updated_at = {
+                store.get("vector_store_id"): store.get("updated_at") for store in stores
+            }
+            for store in cached[1]:
+                store_id = store.get("vector_store_id")
+                if store_id is None:
+                    continue
+                if store_id not in updated_at or updated_at[store_id] != store.get("updated_at"):
+                    _RESULT_CACHE.invalidate(store_id)
+                    _SEMANTIC_CACHE.invalidate(store_id)
+
+        _STORES_CACHE = (time.monotonic(), stores, name_to_id)
+        return stores, name_to_id
+
+
+def _on_store_refresh_done(task: "asyncio.Task[Any]") -> None:
+    """Consume the outcome of a background refresh; failures retry on next use."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _schedule_store_refresh() -> None:
+    """Start a background catalogue refresh unless one is already running."""
+    global _STORES_REFRESH_TASK
+
+    if _STORES_REFRESH_TASK is None or _STORES_REFRESH_TASK.done():
+        _STORES_REFRESH_TASK = asyncio.create_task(_refresh_store_catalogue())
+        _STORES_REFRESH_TASK.add_done_callback(_on_store_refresh_done)
+
 
+async def _load_store_catalogue() -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Return the vector store list and a name-to-ID map, cached in memory.
 
-async def _resolve_vector_store_id(vector_store: Optional[str]) -> str:
-    """Resolve a vector store name or ID to an actual ID.
+    The catalogue is considered fresh for STORES_CACHE_TTL seconds. For one
+    further TTL period the stale copy is still returned while a refresh runs
+    in the background, so name lookups don't wait on the list request; after
+    that, or when nothing is cached yet, callers wait for a refresh.
+
+    Returns:
+        Tuple of (list of vector store dictionaries, mapping of name to ID)
+
+    Raises:
+        httpx.HTTPStatusError: If the API request fails
+        httpx.TimeoutException: If the request times out
+    """
+    cached = _STORES_CACHE
+    if cached is not None:
+        age = time.monotonic() - cached[0]
+        if age < STORES_CACHE_TTL:
+            return cached[1], cached[2]
+        if age < 2 * STORES_CACHE_TTL:
+            _schedule_store_refresh()
+            return cached[1], cached[2]
+
+    return await _refresh_store_catalogue()
+
+
+async def _list_vector_stores() -> List[Dict[str, Any]]:
+    """Return all available vector stores, served from the in-memory cache.
+
+    Returns:
+        List of vector store dictionaries with id, name, description, etc.
+
+    Raises:
+        httpx.HTTPStatusError: If the API request fails
+        httpx.TimeoutException: If the request times out
+    """
+    stores, _ = await _load_store_catalogue()
+    return stores
+
+
+async def _resolve_vector_store_id(name: str) -> str:
+    """Resolve a vector store name to its ID using the cached catalogue.
+
+    Callers handle the default store and direct IDs themselves; this only
+    does the name lookup. A name missing from a catalogue older than
+    STORES_MISS_REFRESH_INTERVAL triggers one refresh before giving up, so
+    newly created stores resolve at once without every misspelt name
+    downloading the list again.
 
     Args:
-        vector_store: Vector store name, ID, or None for default
+        name: Vector store name
 
     Returns:
         Resolved vector store ID
@@ -154,34 +696,31 @@ async def _resolve_vector_store_id(vector_store: Optional[str]) -> str:
     Raises:
         ValueError: If the named store is not found
     """
-    # Use default if not specified
-    if vector_store is None:
-        return VECTOR_STORE_ID
-
-    # Check if it looks like an ID (all digits)
-    if vector_store.isdigit():
-        return vector_store
-
-    # Assume it's a name - fetch list and resolve
     try:
-        stores = await _list_vector_stores()
-
-        # Try to find by name
-        for store in stores:
-            if store.get("vector_store_name") == vector_store:
-                return store["vector_store_id"]
+        _, name_to_id = await _load_store_catalogue()
+
+        # Try to find by name; the store may be newer than the cached catalogue,
+        # unless that catalogue was only just fetched (possibly by this call)
+        store_id = name_to_id.get(name)
+        if (
+            store_id is None
+            and time.monotonic() - _STORES_CACHE[0] >= STORES_MISS_REFRESH_INTERVAL
+        ):
+            _, name_to_id = await _refresh_store_catalogue()
+            store_id = name_to_id.get(name)
+        if store_id is not None:
+            return store_id
 
         # Not found - provide helpful error
-        available_names = [s.get("vector_store_name", "unknown") for s in stores]
         raise ValueError(
-            f"Vector store '{vector_store}' not found. "
-            f"Available stores: {', '.join(available_names)}. "
+            f"Vector store '{name}' not found. "
+            f"Available stores: {', '.join(name_to_id)}. "
             f"Use litellm_list_vector_stores tool to see all options."
         )
 
     except httpx.HTTPError as e:
         # If listing fails, assume it's a direct ID and let the search fail with better error
-        return vector_store
+        return name
 
 
 async def _make_vector_store_request(
@@ -201,29 +740,178 @@ async def _make_vector_store_request(
         httpx.HTTPStatusError: If the API request fails
         httpx.TimeoutException: If the request times out
     """
-    url = f"{API_BASE_URL}/v1/vector_stores/{vector_store_id}/search"
-
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    request_body: Dict[str, Any] = {
+    request_body = {
+        **_BASE_SEARCH_BODY,
         "query": query,
         "vector_store_id": vector_store_id,
-        "custom_llm_provider": "vertex_ai",
     }
 
-    # Add optional Vertex AI configuration if provided
-    if VERTEX_AI_PROJECT:
-        request_body["vertex_ai_project"] = VERTEX_AI_PROJECT
-    if VERTEX_AI_LOCATION:
-        request_body["vertex_ai_location"] = VERTEX_AI_LOCATION
+    response = await _HTTP_CLIENT.post(
+        f"/v1/vector_stores/{vector_store_id}/search", json=request_body
+    )
+    response.raise_for_status()
+    return _loads_json(response.content)
+
+
+async def _embed_query(query: str) -> Optional[List[float]]:
+    """Embed a search query for the semantic cache.
+
+    Embeddings are memoized in _EMBEDDING_CACHE, so repeated queries don't
+    pay for another embedding request.
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(url, headers=headers, json=request_body)
+    Args:
+        query: Search query string
+
+    Returns:
+        Unit-normalized embedding, or None if the semantic cache is disabled
+        or the embedding request failed
+    """
+    if not EMBEDDING_MODEL:
+        return None
+
+    cached = await _EMBEDDING_CACHE.get(EMBEDDING_MODEL, query)
+    if cached is not None:
+        return cached
+
+    try:
+        response = await _HTTP_CLIENT.post(
+            "/v1/embeddings",
+            json={"model": EMBEDDING_MODEL, "input": query},
+            timeout=EMBEDDING_TIMEOUT,
+        )
         response.raise_for_status()
-        return response.json()
+        embedding = _loads_json(response.content)["data"][0]["embedding"]
+        norm = math.sqrt(sum(x * x for x in embedding))
+        if not norm:
+            return None
+        embedding = [x / norm for x in embedding]
+    except (httpx.HTTPError, KeyError, IndexError, TypeError, ValueError):
+        # The semantic cache is best-effort; fall back to a regular search.
+        # ValueError covers non-JSON bodies, TypeError malformed embeddings
+        return None
+
+    await _EMBEDDING_CACHE.set(EMBEDDING_MODEL, query, embedding)
+    return embedding
+
+
+async def _search_and_cache(
+    key: Tuple[str, str, int], query: str, max_results: int, vector_store_id: str
+) -> List[Dict[str, Any]]:
+    """Search the vector store and cache the results under the given key.
+
+    Args:
+        key: Tuple of (vector store ID, normalized query, max_results)
+        query: Search query string
+        max_results: Maximum number of results to return
+        vector_store_id: The vector store ID to search
+
+    Returns:
+        List of search result dictionaries
+    """
+    data = await _make_vector_store_request(query, max_results, vector_store_id)
+    results = data.get("data", [])
+    _RESULT_CACHE.set(key, results)
+    return results
+
+
+def _finish_inflight_search(key: Tuple[str, str, int], task: "asyncio.Task[Any]") -> None:
+    """Forget a completed in-flight search and consume its outcome."""
+    if _INFLIGHT_SEARCHES.get(key) is task:
+        del _INFLIGHT_SEARCHES[key]
+    if not task.cancelled():
+        task.exception()
+
+
+async def _search_single_flight(
+    key: Tuple[str, str, int], query: str, max_results: int, vector_store_id: str
+) -> List[Dict[str, Any]]:
+    """Search the vector store, joining an identical search already in flight.
+
+    The upstream request runs in its own task, so a caller that is cancelled
+    does not cancel the request for the other callers waiting on it.
+
+    Args:
+        key: Tuple of (vector store ID, normalized query, max_results)
+        query: Search query string
+        max_results: Maximum number of results to return
+        vector_store_id: The vector store ID to search
+
+    Returns:
+        List of search result dictionaries
+
+    Raises:
+        httpx.HTTPStatusError: If the API request fails
+        httpx.TimeoutException: If the request times out
+    """
+    task = _INFLIGHT_SEARCHES.get(key)
+    if task is None:
+        task = asyncio.create_task(
+            _search_and_cache(key, query, max_results, vector_store_id)
+        )
+        _INFLIGHT_SEARCHES[key] = task
+        task.add_done_callback(functools.partial(_finish_inflight_search, key))
+    return await asyncio.shield(task)
+
+
+async def _search_core(params: VectorStoreSearchInput) -> List[Dict[str, Any]]:
+    """Run a search through the caches and return the raw results.
+
+    This is the search tool without its output formatting, for in-process
+    callers that want the result dictionaries rather than a rendered string.
+
+    Args:
+        params: Validated search input parameters
+
+    Returns:
+        List of search result dictionaries
+
+    Raises:
+        ValueError: If the vector store name can't be resolved
+        httpx.HTTPStatusError: If the API request fails
+        httpx.TimeoutException: If the request times out
+    """
+    # Resolve vector store name/ID to actual ID; the default store and
+    # direct IDs need no lookup, so skip the coroutine for them
+    if params.vector_store is None:
+        resolved_id = VECTOR_STORE_ID
+    elif _VECTOR_STORE_ID_RE.fullmatch(params.vector_store):
+        resolved_id = params.vector_store
+    else:
+        resolved_id = await _resolve_vector_store_id(params.vector_store)
+
+    # Serve repeated searches from the result cache unless bypassed
+    cache_key = (resolved_id, params.query.lower(), params.max_results)
+    results = None if params.no_cache else _RESULT_CACHE.get(cache_key)
+
+    if results is None and params.no_cache:
+        # Make API request using validated parameters
+        data = await _make_vector_store_request(
+            params.query, params.max_results, resolved_id
+        )
+
+        # Extract results from response
+        results = data.get("data", [])
+    elif results is None:
+        # Paraphrases of a recent search can reuse its results
+        embedding = await _embed_query(params.query)
+        similar = None
+        if embedding is not None:
+            similar = _SEMANTIC_CACHE.get(resolved_id, params.max_results, embedding)
+
+        if similar is not None:
+            # Keep the original fetch time so LITELLM_RESULT_TTL still bounds
+            # how old the served results can be
+            fetched_at, results = similar
+            _RESULT_CACHE.set(cache_key, results, fetched_at=fetched_at)
+        else:
+            # Concurrent identical searches share one upstream request
+            results = await _search_single_flight(
+                cache_key, params.query, params.max_results, resolved_id
+            )
+            if embedding is not None:
+                _SEMANTIC_CACHE.set(resolved_id, params.max_results, embedding, results)
+
+    return results
 
 
 def _handle_api_error(e: Exception) -> str:
@@ -271,15 +959,91 @@ def _handle_api_error(e: Exception) -> str:
     return f"Error: Unexpected error occurred: {type(e).__name__} - {str(e)}"
 
 
+def _loads_json(data: bytes) -> Any:
+    """Parse a JSON document, using orjson when it is installed.
+
+    Args:
+        data: Raw JSON bytes, e.g. an HTTP response body
+
+    Returns:
+        The decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_json(obj: Any, pretty: bool = True) -> str:
+    """Serialize an object to a JSON string, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable object
+        pretty: Indent with two spaces for readability; compact when False
+
+    Returns:
+        JSON-formatted string
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None).decode()
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _extract_text(result: Dict[str, Any]) -> str:
+    """Return the first text content item of a search result.
+
+    Args:
+        result: Search result dictionary
+
+    Returns:
+        Text of the first item with type 'text', or an empty string
+    """
+    for item in result.get("content", ()):
+        if item.get("type") == "text":
+            return item.get("text", "")
+    return ""
+
+
+def _take_within_budget(chunks: Iterable[str], budget: int) -> Tuple[List[str], bool]:
+    """Collect rendered chunks until adding another would exceed the budget.
+
+    The first chunk is always kept so an oversized result still returns
+    something useful. Each chunk is counted with one extra character for the
+    separator it is joined with.
+
+    Args:
+        chunks: Rendered per-result chunks, produced lazily
+        budget: Maximum number of characters to collect
+
+    Returns:
+        Tuple of (collected chunks, whether any chunks were dropped)
+    """
+    taken: List[str] = []
+    total = 0
+    for chunk in chunks:
+        total += len(chunk) + 1
+        if taken and total > budget:
+            return taken, True
+        taken.append(chunk)
+    return taken, False
+
+
 def _format_markdown_results(
-    data: List[Dict[str, Any]], query: str, truncated: bool = False
+    data: List[Dict[str, Any]], query: str, preview_chars: Optional[int] = None
 ) -> str:
     """Format search results as human-readable Markdown.
 
+    Results are rendered in a single pass and dropped from the tail once the
+    response would exceed CHARACTER_LIMIT, in which case a truncation notice
+    is added to the header. Snippets longer than the content limit are cut
+    with a note giving their full length.
+
     Args:
         data: List of search result dictionaries
         query: The original search query
-        truncated: Whether results were truncated due to character limit
+        preview_chars: Optional cap on content characters per result, below
+            MAX_CONTENT_LENGTH
 
     Returns:
         Markdown-formatted string
@@ -287,107 +1051,274 @@ def _format_markdown_results(
     if not data:
         return f"No results found for query: '{query}'\n\nTry:\n- Using more specific keywords\n- Checking spelling\n- Using technical terms from your codebase"
 
-    lines = [
+    content_limit = MAX_CONTENT_LENGTH
+    if preview_chars is not None:
+        content_limit = min(preview_chars, MAX_CONTENT_LENGTH)
+
+    def _blocks() -> Iterator[str]:
+        # One f-string per block; rendering stops once the budget is spent
+        for idx, result in enumerate(data, 1):
+            text = _extract_text(result)
+            if len(text) > content_limit:
+                text = f"{text[:content_limit]}\n... (truncated, {len(text)} total characters)"
+
+            yield (
+                f"## Result {idx}: {result.get('filename', 'Unknown')}\n"
+                f"\n"
+                f"- **Relevance Score:** {result.get('score', 0):.4f}\n"
+                f"- **File Path:** `{result.get('file_id', '')}`\n"
+                f"\n"
+                f"### Content:\n"
+                f"```\n"
+                f"{text}\n"
+                f"```\n"
+                f"\n"
+                f"---\n"
+            )
+
+    blocks, truncated = _take_within_budget(_blocks(), CHARACTER_LIMIT - HEADER_RESERVE)
+
+    header = [
         "# Vector Store Search Results",
         "",
         f"**Query:** {query}",
-        f"**Results Found:** {len(data)}",
+        f"**Results Found:** {len(blocks)}",
     ]
 
     if truncated:
-        lines.append("")
-        lines.append(
+        header.append("")
+        header.append(
             "⚠️  **Results truncated** due to size limit. Use max_results parameter "
             "to control the number of results returned."
         )
 
-    lines.append("")
-
-    for idx, result in enumerate(data, 1):
-        score = result.get("score", 0)
-        filename = result.get("filename", "Unknown")
-        file_id = result.get("file_id", "")
+    header.append("")
 
-        # Extract text content
-        content_items = result.get("content", [])
-        text_content = ""
-        for item in content_items:
-            if item.get("type") == "text":
-                text_content = item.get("text", "")
-                break
-
-        lines.append(f"## Result {idx}: {filename}")
-        lines.append("")
-        lines.append(f"- **Relevance Score:** {score:.4f}")
-        lines.append(f"- **File Path:** `{file_id}`")
-        lines.append("")
-        lines.append("### Content:")
-        lines.append("```")
-
-        # Truncate individual content items to keep response manageable
-        max_content_length = 2000
-        if len(text_content) > max_content_length:
-            lines.append(text_content[:max_content_length])
-            lines.append(
-                f"... (truncated, {len(text_content)} total characters)"
-            )
-        else:
-            lines.append(text_content)
+    return "\n".join(["\n".join(header), *blocks])
 
-        lines.append("```")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
 
-    return "\n".join(lines)
+def _iter_json_results(
+    data: List[Dict[str, Any]], preview_chars: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield one structured entry per search result.
 
+    Args:
+        data: List of search result dictionaries
+        preview_chars: Optional cap on content characters per result
 
-def _format_json_results(
-    data: List[Dict[str, Any]], query: str, truncated: bool = False
-) -> str:
-    """Format search results as structured JSON.
+    Yields:
+        Dictionary with score, filename, file_id, content and attributes
+    """
+    for result in data:
+        yield {
+            "score": result.get("score", 0),
+            "filename": result.get("filename", "Unknown"),
+            "file_id": result.get("file_id", ""),
+            "content": _extract_text(result)[:preview_chars],
+            "attributes": result.get("attributes", {}),
+        }
+
+
+def _json_response(
+    query: str,
+    entries: List[Dict[str, Any]],
+    truncated: bool,
+    preview_chars: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Wrap structured result entries in the JSON search response.
 
     Args:
-        data: List of search result dictionaries
         query: The original search query
-        truncated: Whether results were truncated due to character limit
+        entries: Entries from _iter_json_results to include
+        truncated: Whether entries were dropped to fit CHARACTER_LIMIT
+        preview_chars: Optional cap on content characters per result
 
     Returns:
-        JSON-formatted string
+        Response dictionary with query, total_results, truncated and results
     """
     response = {
         "query": query,
-        "total_results": len(data),
+        "total_results": len(entries),
         "truncated": truncated,
-        "results": [],
+        "results": entries,
     }
 
+    if preview_chars is not None:
+        response["truncated_to"] = preview_chars
+
     if truncated:
         response["truncation_message"] = (
             "Results were truncated to fit within character limits. "
             "Reduce max_results to get complete content for each result."
         )
 
-    for result in data:
-        # Extract text content
-        content_items = result.get("content", [])
-        text_content = ""
-        for item in content_items:
-            if item.get("type") == "text":
-                text_content = item.get("text", "")
-                break
-
-        response["results"].append(
-            {
-                "score": result.get("score", 0),
-                "filename": result.get("filename", "Unknown"),
-                "file_id": result.get("file_id", ""),
-                "content": text_content,
-                "attributes": result.get("attributes", {}),
-            }
-        )
+    return response
+
+
+def _fit_json_entries(entries: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+    """Keep leading entries while their compact encoding fits the budget.
+
+    Args:
+        entries: Entries from _iter_json_results
+
+    Returns:
+        Tuple of (kept entries, whether any entries were dropped)
+    """
+    kept, truncated = _take_within_budget(
+        (_dumps_json(entry, pretty=False) for entry in entries),
+        CHARACTER_LIMIT - HEADER_RESERVE,
+    )
+    return entries[: len(kept)], truncated
+
+
+def _may_fit_json(entries: List[Dict[str, Any]]) -> bool:
+    """Return False when the entries' content alone exceeds CHARACTER_LIMIT.
+
+    Encoding never shortens the content, so this rules out a whole-response
+    dump that is certain to be too long without doing it.
 
-    return json.dumps(response, indent=2)
+    Args:
+        entries: Entries from _iter_json_results
+
+    Returns:
+        Whether the encoded response could fit within CHARACTER_LIMIT
+    """
+    return sum(len(entry["content"]) for entry in entries) <= CHARACTER_LIMIT
+
+
+def _build_json_results(
+    data: List[Dict[str, Any]], query: str, preview_chars: Optional[int] = None
+) -> Dict[str, Any]:
+    """Build the structured JSON search response.
+
+    The whole response is encoded once; only when that exceeds
+    CHARACTER_LIMIT, or clearly would, are results added one by one until the compact encoding
+    would no longer fit.
+
+    Args:
+        data: List of search result dictionaries
+        query: The original search query
+        preview_chars: Optional cap on content characters per result
+
+    Returns:
+        Response dictionary with query, total_results, truncated and results
+    """
+    entries = list(_iter_json_results(data, preview_chars))
+    response = _json_response(query, entries, False, preview_chars)
+    if not _may_fit_json(entries) or len(_dumps_json(response, pretty=False)) > CHARACTER_LIMIT:
+        response = _json_response(query, *_fit_json_entries(entries), preview_chars)
+    return response
+
+
+def _format_json_results(
+    data: List[Dict[str, Any]], query: str, preview_chars: Optional[int] = None
+) -> str:
+    """Format search results as structured JSON.
+
+    The full response is pretty-printed once and returned when it fits
+    within CHARACTER_LIMIT, skipping that attempt when the content alone is
+    too long. Otherwise results are dropped from the tail to
+    fit, and the response is emitted as compact JSON if still too long.
+
+    Args:
+        data: List of search result dictionaries
+        query: The original search query
+        preview_chars: Optional cap on content characters per result
+
+    Returns:
+        JSON-formatted string
+    """
+    entries = list(_iter_json_results(data, preview_chars))
+    if _may_fit_json(entries):
+        formatted = _dumps_json(_json_response(query, entries, False, preview_chars))
+        if len(formatted) <= CHARACTER_LIMIT:
+            return formatted
+
+    response = _json_response(query, *_fit_json_entries(entries), preview_chars)
+    formatted = _dumps_json(response)
+    if len(formatted) > CHARACTER_LIMIT:
+        formatted = _dumps_json(response, pretty=False)
+    return formatted
+
+
+def _format_markdown_stores(stores: List[Dict[str, Any]]) -> str:
+    """Format the vector store list as human-readable Markdown.
+
+    Args:
+        stores: List of vector store dictionaries
+
+    Returns:
+        Markdown-formatted string
+    """
+    lines = [
+        "# Available Vector Stores",
+        "",
+        f"**Total Stores:** {len(stores)}",
+        "",
+    ]
+
+    for idx, store in enumerate(stores, 1):
+        name = store.get("vector_store_name", "Unnamed")
+        store_id = store.get("vector_store_id", "Unknown")
+        description = store.get("vector_store_description", "No description")
+        provider = store.get("custom_llm_provider", "Unknown")
+        created = store.get("created_at", "Unknown")
+
+        lines.append(f"## {idx}. {name}")
+        lines.append("")
+        lines.append(f"- **ID:** `{store_id}`")
+        lines.append(f"- **Description:** {description}")
+        lines.append(f"- **Provider:** {provider}")
+        lines.append(f"- **Created:** {created}")
+        lines.append("")
+        lines.append(f"**Usage:** `vector_store=\"{name}\"` or `vector_store=\"{store_id}\"`")
+        lines.append("")
+        lines.append("---")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def _format_json_stores(stores: List[Dict[str, Any]]) -> str:
+    """Format the vector store list as structured JSON.
+
+    Args:
+        stores: List of vector store dictionaries
+
+    Returns:
+        JSON-formatted string
+    """
+    formatted_stores = []
+    for store in stores:
+        formatted_stores.append({
+            "id": store.get("vector_store_id"),
+            "name": store.get("vector_store_name"),
+            "description": store.get("vector_store_description"),
+            "provider": store.get("custom_llm_provider"),
+            "created_at": store.get("created_at"),
+            "updated_at": store.get("updated_at"),
+            "metadata": store.get("vector_store_metadata"),
+            "params": store.get("litellm_params"),
+        })
+
+    return _dumps_json({
+        "total_count": len(stores),
+        "vector_stores": formatted_stores
+    })
+
+
+# Formatter dispatch tables keyed by requested response format
+_RESULT_FORMATTERS: Dict[
+    ResponseFormat, Callable[[List[Dict[str, Any]], str, Optional[int]], str]
+] = {
+    ResponseFormat.MARKDOWN: _format_markdown_results,
+    ResponseFormat.JSON: _format_json_results,
+}
+
+_STORE_FORMATTERS: Dict[ResponseFormat, Callable[[List[Dict[str, Any]]], str]] = {
+    ResponseFormat.MARKDOWN: _format_markdown_stores,
+    ResponseFormat.JSON: _format_json_stores,
+}
 
 
 # Tool definitions
@@ -457,68 +1388,21 @@ async def litellm_list_vector_stores(response_format: ResponseFormat = ResponseF
 
         if not stores:
             if response_format == ResponseFormat.JSON:
-                return json.dumps({
+                return _dumps_json({
                     "total_count": 0,
                     "vector_stores": [],
                     "message": "No vector stores found. Your API key may not have access to any stores."
-                }, indent=2)
+                })
             else:
                 return "No vector stores found.\n\nPossible reasons:\n- Your API key doesn't have access to any vector stores\n- No vector stores are configured in LiteLLM"
 
         # Format response based on requested format
-        if response_format == ResponseFormat.MARKDOWN:
-            lines = [
-                "# Available Vector Stores",
-                "",
-                f"**Total Stores:** {len(stores)}",
-                "",
-            ]
-
-            for idx, store in enumerate(stores, 1):
-                name = store.get("vector_store_name", "Unnamed")
-                store_id = store.get("vector_store_id", "Unknown")
-                description = store.get("vector_store_description", "No description")
-                provider = store.get("custom_llm_provider", "Unknown")
-                created = store.get("created_at", "Unknown")
-
-                lines.append(f"## {idx}. {name}")
-                lines.append("")
-                lines.append(f"- **ID:** `{store_id}`")
-                lines.append(f"- **Description:** {description}")
-                lines.append(f"- **Provider:** {provider}")
-                lines.append(f"- **Created:** {created}")
-                lines.append("")
-                lines.append(f"**Usage:** `vector_store=\"{name}\"` or `vector_store=\"{store_id}\"`")
-                lines.append("")
-                lines.append("---")
-                lines.append("")
-
-            return "\n".join(lines)
-
-        else:
-            # JSON format
-            formatted_stores = []
-            for store in stores:
-                formatted_stores.append({
-                    "id": store.get("vector_store_id"),
-                    "name": store.get("vector_store_name"),
-                    "description": store.get("vector_store_description"),
-                    "provider": store.get("custom_llm_provider"),
-                    "created_at": store.get("created_at"),
-                    "updated_at": store.get("updated_at"),
-                    "metadata": store.get("vector_store_metadata"),
-                    "params": store.get("litellm_params"),
-                })
-
-            return json.dumps({
-                "total_count": len(stores),
-                "vector_stores": formatted_stores
-            }, indent=2)
+        return _STORE_FORMATTERS[response_format](stores)
 
     except Exception as e:
         error_msg = _handle_api_error(e)
         if response_format == ResponseFormat.JSON:
-            return json.dumps({"error": error_msg}, indent=2)
+            return _dumps_json({"error": error_msg})
         return error_msg
 
 
@@ -548,6 +1432,8 @@ async def litellm_search_vector_store(params: VectorStoreSearchInput) -> str:
             - response_format (ResponseFormat): Output format ('markdown' or 'json', default: 'markdown')
             - vector_store (Optional[str]): Vector store to search - can be name or ID (default: uses LITELLM_VECTOR_STORE_ID)
                 Examples: "panser-corpus", "internal-corpus", "2341871806232657920"
+            - preview_chars (Optional[int]): Cap content per result at this many characters
+            - no_cache (bool): Skip the result cache for this search (default: False)
 
     Returns:
         str: Search results in the requested format
@@ -560,6 +1446,7 @@ async def litellm_search_vector_store(params: VectorStoreSearchInput) -> str:
                 "query": str,           # The search query
                 "total_results": int,   # Number of results returned
                 "truncated": bool,      # Whether results were truncated
+                "truncated_to": int,    # Content cap per result (only with preview_chars)
                 "results": [
                     {
                         "score": float,      # Relevance score (0-1, higher = better)
@@ -598,61 +1485,103 @@ async def litellm_search_vector_store(params: VectorStoreSearchInput) -> str:
         - Responses are limited to 25,000 characters total
         - Individual content snippets truncated at 2,000 characters
         - Reduce max_results if hitting character limits
+        - Identical searches are served from an in-memory cache (LITELLM_RESULT_TTL)
+        - With LITELLM_EMBEDDING_MODEL set, similar queries also reuse cached results
     """
     try:
-        # Resolve vector store name/ID to actual ID
-        resolved_id = await _resolve_vector_store_id(params.vector_store)
-
-        # Make API request using validated parameters
-        data = await _make_vector_store_request(params.query, params.max_results, resolved_id)
-
-        # Extract results from response
-        results = data.get("data", [])
+        results = await _search_core(params)
 
         if not results:
             if params.response_format == ResponseFormat.JSON:
-                return json.dumps(
+                return _dumps_json(
                     {
                         "query": params.query,
                         "total_results": 0,
                         "truncated": False,
                         "results": [],
                         "message": f"No results found for query: '{params.query}'",
-                    },
-                    indent=2,
+                    }
                 )
             else:
                 return _format_markdown_results([], params.query)
 
-        # Format response based on requested format
-        if params.response_format == ResponseFormat.MARKDOWN:
-            formatted_result = _format_markdown_results(results, params.query)
-        else:
-            formatted_result = _format_json_results(results, params.query)
-
-        # Check character limit and truncate if needed
-        if len(formatted_result) > CHARACTER_LIMIT:
-            # Reduce results by half and try again
-            truncated_results = results[: max(1, len(results) // 2)]
-
-            if params.response_format == ResponseFormat.MARKDOWN:
-                formatted_result = _format_markdown_results(
-                    truncated_results, params.query, truncated=True
-                )
-            else:
-                formatted_result = _format_json_results(
-                    truncated_results, params.query, truncated=True
-                )
-
-        return formatted_result
+        # Format response based on requested format, trimmed to CHARACTER_LIMIT
+        return _RESULT_FORMATTERS[params.response_format](
+            results, params.query, params.preview_chars
+        )
 
     except Exception as e:
         error_msg = _handle_api_error(e)
         if params.response_format == ResponseFormat.JSON:
-            return json.dumps({"error": error_msg}, indent=2)
+            return _dumps_json({"error": error_msg})
         return error_msg
 
 
+@mcp.tool(
+    name="litellm_batch_search_vector_store",
+    annotations={
+        "title": "Batch Search LiteLLM Vector Stores",
+        "readOnlyHint": True,  # Tool does not modify environment
+        "destructiveHint": False,  # Tool does not perform destructive operations
+        "idempotentHint": True,  # Repeated calls with same args have no additional effect
+        "openWorldHint": True,  # Tool interacts with external LiteLLM service
+    },
+)
+async def litellm_batch_search_vector_store(
+    searches: Annotated[
+        List[VectorStoreSearchInput],
+        Field(
+            description="Searches to run, each with the same fields as litellm_search_vector_store",
+            min_length=1,
+            max_length=MAX_BATCH_SEARCHES,
+        ),
+    ],
+) -> List[str]:
+    """Run several vector store searches in one tool call.
+
+    Each search accepts the same parameters as litellm_search_vector_store and
+    may target a different vector store. Searches run concurrently, store
+    names are resolved from one shared catalogue lookup, and identical
+    searches share a single upstream request.
+
+    Args:
+        searches (List[VectorStoreSearchInput]): 1-10 searches, each containing:
+            - query (str): Natural language search query (2-500 chars)
+            - max_results (int): Number of results to return (1-20, default: 5)
+            - response_format (ResponseFormat): Output format ('markdown' or 'json', default: 'markdown')
+            - vector_store (Optional[str]): Vector store name or ID (default: uses LITELLM_VECTOR_STORE_ID)
+            - preview_chars (Optional[int]): Cap content per result at this many characters
+            - no_cache (bool): Skip the result cache for this search (default: False)
+
+    Returns:
+        List[str]: One result per search, in the order given, each formatted
+        exactly as litellm_search_vector_store would return it
+
+    Examples:
+        Use when:
+        - "Compare Redis setup in internal-corpus and panser-corpus" →
+          two searches with query="Redis configuration" and different vector_store
+        - "Find auth, logging and deployment code" → three searches, one per topic
+
+        Don't use when:
+        - You only need a single search (use litellm_search_vector_store)
+
+    Error Handling:
+        - Each search reports its own errors in its result slot, so one
+          failing search does not affect the others
+
+    Performance Notes:
+        - LiteLLM has no batch search endpoint; searches are sent concurrently
+          over the shared connection pool instead
+        - Each result is limited to 25,000 characters
+    """
+    # LiteLLM has no batch search endpoint, so fan out over the shared client.
+    # Concurrent name lookups already share one catalogue refresh.
+    return list(
+        await asyncio.gather(*(litellm_search_vector_store(params) for params in searches))
+    )
+
+
 if __name__ == "__main__":
     # Run the MCP server
     mcp.run()
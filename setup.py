@@ -10,8 +10,12 @@ setup(
     install_requires=[
         "mcp>=1.0.0",
         "python-dotenv>=1.0.0",
-        "requests>=2.31.0",
+        "httpx[http2]>=0.27",
     ],
+    extras_require={
+        "speedups": ["orjson>=3.9.0"],
+        "test": ["pytest>=8.0", "pytest-asyncio>=0.24", "pytest-xdist>=3.5"],
+    },
     entry_points={
         "console_scripts": [
             "litellm-vector-store-mcp=server:main",
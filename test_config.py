@@ -8,7 +8,7 @@ Run this script to verify your .env configuration is correct.
 import os
 import sys
 
-import requests
+import httpx
 from dotenv import load_dotenv
 
 
@@ -68,7 +68,8 @@ def test_configuration():
 
     try:
         print(f"\nSearching: {url}")
-        response = requests.post(url, headers=headers, json=request_body, timeout=30)
+        with httpx.Client(timeout=30.0, http2=True) as client:
+            response = client.post(url, headers=headers, json=request_body)
 
         if response.status_code == 200:
             data = response.json()
@@ -89,10 +90,14 @@ def test_configuration():
             print(f"  Response: {response.text}")
             return False
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print(f"\n✗ Request timed out")
         print(f"  Check your network connection and LITELLM_BASE_URL")
         return False
+    except httpx.HTTPError as e:
+        print(f"\n✗ Request failed: {e}")
+        print(f"  Check your network connection and LITELLM_BASE_URL")
+        return False
     except Exception as e:
         print(f"\n✗ Error: {e}")
         return False
@@ -1,184 +1,258 @@
 #!/usr/bin/env python3
 """
-Test script for multi-vector store functionality
+Tests for multi-vector store functionality
 
-This script demonstrates:
+These run against the LiteLLM server configured in .env and cover:
 1. Listing all available vector stores
 2. Searching by vector store name
 3. Searching by vector store ID
-4. Error handling for invalid stores
+4. Searching the default vector store
+5. Error handling for invalid stores
+
+Run with `pytest test_multi_store.py`, or spread the tests across workers
+with `pytest -n auto --dist=loadfile` (requires pytest-xdist).
 """
 
-import asyncio
-import json
+import sys
+from typing import List, Optional, Set
+
+import pytest
+from pydantic import BaseModel
+
+from conftest import LIVE_SERVER_CONFIGURED
+
+# conftest fills in placeholder credentials for the offline tests; these
+# tests need the real ones from .env
+if not LIVE_SERVER_CONFIGURED:
+    pytest.skip(
+        "LITELLM_API_KEY and LITELLM_VECTOR_STORE_ID must be set", allow_module_level=True
+    )
+
+# Test inputs are trusted literals, so they are built with model_construct()
+# to skip validation; the MCP tool boundary still validates client input
 from server import (
+    _RESULT_CACHE,
+    _build_json_results,
+    _search_core,
+    litellm_batch_search_vector_store,
     litellm_list_vector_stores,
     litellm_search_vector_store,
     VectorStoreSearchInput,
     ResponseFormat,
 )
 
+# The server shares one HTTP client and asyncio locks across calls, so every
+# test in this module runs on the same event loop
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+NAMED_SEARCHES = [
+    ("internal-corpus", "Redis configuration"),
+    ("panser-corpus", "authentication"),
+    ("mcp-servers-corpus", "FastMCP"),
+]
+PREVIEW_CHARS = 200
+
+
+# Typed views of the JSON responses; unknown fields are ignored, and
+# pydantic-core parses straight into these without an intermediate dict
+class StoreSummary(BaseModel):
+    id: str
+    name: Optional[str] = None
+
+
+class StoreListResponse(BaseModel):
+    total_count: int
+    vector_stores: List[StoreSummary]
+
+
+class SearchResultItem(BaseModel):
+    filename: str
+    score: float
+    content: str
+
+
+class SearchResponse(BaseModel):
+    query: str
+    total_results: int
+    truncated: bool
+    truncated_to: Optional[int] = None
+    results: List[SearchResultItem]
+
+
+class ErrorResponse(BaseModel):
+    error: str
+
+
+async def list_stores() -> StoreListResponse:
+    """Fetch the store catalogue through the list tool"""
+    return StoreListResponse.model_validate_json(
+        await litellm_list_vector_stores(ResponseFormat.JSON)
+    )
+
+
+async def store_names() -> Set[str]:
+    """Return the names of the configured vector stores"""
+    return {store.name for store in (await list_stores()).vector_stores if store.name}
+
+
+def check_search_response(
+    data: SearchResponse, query: str, preview_chars: Optional[int] = None
+) -> None:
+    """Assert the invariants every successful search response must hold"""
+    assert data.query == query
+    assert data.total_results == len(data.results)
+    if preview_chars is not None:
+        assert all(len(result.content) <= preview_chars for result in data.results)
+    if data.results:
+        assert data.truncated_to == preview_chars
+
+    scores = [result.score for result in data.results]
+    assert scores == sorted(scores, reverse=True), "results should be ranked by score"
+
+
+async def test_list_stores_markdown():
+    """The Markdown catalogue has a header and one section per store"""
+    result = await litellm_list_vector_stores(ResponseFormat.MARKDOWN)
+    data = await list_stores()
+
+    assert result.startswith("# Available Vector Stores")
+    assert f"**Total Stores:** {data.total_count}" in result
+
+
+async def test_list_stores_json():
+    """The JSON catalogue counts its stores and gives each one an ID"""
+    data = await list_stores()
 
-async def test_list_stores():
-    """Test listing all available vector stores"""
-    print("=" * 60)
-    print("TEST 1: List All Vector Stores")
-    print("=" * 60)
-
-    # Test Markdown format
-    print("\n📋 Markdown Format:")
-    print("-" * 60)
-    result_md = await litellm_list_vector_stores(ResponseFormat.MARKDOWN)
-    print(result_md)
-
-    # Test JSON format
-    print("\n📊 JSON Format:")
-    print("-" * 60)
-    result_json = await litellm_list_vector_stores(ResponseFormat.JSON)
-    data = json.loads(result_json)
-    print(f"Total stores: {data['total_count']}")
-    print("\nStores:")
-    for store in data['vector_stores']:
-        print(f"  - {store['name']} ({store['id']})")
-
-
-async def test_search_by_name():
-    """Test searching using vector store names"""
-    print("\n" + "=" * 60)
-    print("TEST 2: Search by Vector Store Name")
-    print("=" * 60)
-
-    test_cases = [
-        ("internal-corpus", "Redis configuration"),
-        ("panser-corpus", "authentication"),
-        ("mcp-servers-corpus", "FastMCP"),
-    ]
-
-    for store_name, query in test_cases:
-        print(f"\n🔍 Searching '{store_name}' for: '{query}'")
-        print("-" * 60)
-
-        params = VectorStoreSearchInput(
-            query=query,
-            max_results=2,
-            response_format=ResponseFormat.MARKDOWN,
-            vector_store=store_name,
-        )
-
-        result = await litellm_search_vector_store(params)
-
-        # Show first 500 chars of result
-        print(result[:500])
-        if len(result) > 500:
-            print(f"\n... (truncated, {len(result)} total chars)")
-        print()
+    assert data.total_count == len(data.vector_stores)
+    assert all(store.id for store in data.vector_stores)
+
+
+@pytest.mark.parametrize("store_name,query", NAMED_SEARCHES)
+async def test_search_by_name(store_name: str, query: str):
+    """Searching by friendly name resolves the store and trims previews"""
+    if store_name not in await store_names():
+        pytest.skip(f"Vector store '{store_name}' is not configured")
+
+    params = VectorStoreSearchInput.model_construct(
+        query=query,
+        max_results=2,
+        response_format=ResponseFormat.JSON,
+        vector_store=store_name,
+        preview_chars=PREVIEW_CHARS,
+    )
+    data = SearchResponse.model_validate_json(await litellm_search_vector_store(params))
+
+    check_search_response(data, query, preview_chars=PREVIEW_CHARS)
+
+
+async def test_batch_search_by_name():
+    """The batch tool returns one response per search, in request order"""
+    configured = await store_names()
+    cases = [(name, query) for name, query in NAMED_SEARCHES if name in configured]
+    if not cases:
+        pytest.skip("None of the named test vector stores are configured")
+
+    results = await litellm_batch_search_vector_store(
+        [
+            VectorStoreSearchInput.model_construct(
+                query=query,
+                max_results=2,
+                response_format=ResponseFormat.JSON,
+                vector_store=store_name,
+                preview_chars=PREVIEW_CHARS,
+            )
+            for store_name, query in cases
+        ]
+    )
+
+    assert len(results) == len(cases)
+    for (_, query), result in zip(cases, results):
+        data = SearchResponse.model_validate_json(result)
+        check_search_response(data, query, preview_chars=PREVIEW_CHARS)
+
+
+async def test_repeated_search_hits_cache():
+    """An identical search is served from the result cache"""
+    if _RESULT_CACHE.ttl <= 0:
+        pytest.skip("Result cache is disabled (LITELLM_RESULT_TTL=0)")
+
+    params = VectorStoreSearchInput.model_construct(
+        query="Redis configuration",
+        max_results=2,
+        response_format=ResponseFormat.MARKDOWN,
+        vector_store=None,
+    )
+    first = await litellm_search_vector_store(params)
+    hits = _RESULT_CACHE.hits
+    second = await litellm_search_vector_store(params)
+
+    assert second == first
+    assert _RESULT_CACHE.hits == hits + 1
 
 
 async def test_search_by_id():
-    """Test searching using direct vector store IDs"""
-    print("\n" + "=" * 60)
-    print("TEST 3: Search by Vector Store ID")
-    print("=" * 60)
+    """Searching by direct ID skips name resolution"""
+    stores = (await list_stores()).vector_stores
+    if not stores:
+        pytest.skip("No vector stores are configured")
 
-    # Use a specific ID
-    params = VectorStoreSearchInput(
+    params = VectorStoreSearchInput.model_construct(
         query="Terraform modules",
         max_results=3,
         response_format=ResponseFormat.JSON,
-        vector_store="1111111111111111111",  # internal-corpus ID
+        vector_store=stores[0].id,
+        preview_chars=100,
     )
 
-    print(f"\n🔍 Searching ID '1111111111111111111' for: 'Terraform modules'")
-    print("-" * 60)
-
-    result = await litellm_search_vector_store(params)
-    data = json.loads(result)
+    # Take the result dicts in-process instead of parsing the tool's JSON string
+    results = await _search_core(params)
+    data = SearchResponse.model_validate(
+        _build_json_results(results, params.query, params.preview_chars)
+    )
 
-    print(f"Query: {data['query']}")
-    print(f"Total results: {data['total_results']}")
-    print(f"Truncated: {data['truncated']}")
-    print(f"\nTop result:")
-    if data['results']:
-        top = data['results'][0]
-        print(f"  Filename: {top['filename']}")
-        print(f"  Score: {top['score']}")
-        print(f"  Content preview: {top['content'][:100]}...")
+    check_search_response(data, params.query, preview_chars=100)
 
 
 async def test_search_default():
-    """Test searching without specifying vector store (uses default)"""
-    print("\n" + "=" * 60)
-    print("TEST 4: Search Default Vector Store")
-    print("=" * 60)
-
-    params = VectorStoreSearchInput(
+    """Omitting vector_store searches LITELLM_VECTOR_STORE_ID"""
+    params = VectorStoreSearchInput.model_construct(
         query="GKE cluster",
         max_results=2,
-        response_format=ResponseFormat.MARKDOWN,
-        # vector_store not specified - uses default from env
+        response_format=ResponseFormat.JSON,
+        vector_store=None,  # Uses default from env
+        preview_chars=PREVIEW_CHARS,
     )
+    data = SearchResponse.model_validate_json(await litellm_search_vector_store(params))
 
-    print(f"\n🔍 Searching default vector store for: 'GKE cluster'")
-    print("-" * 60)
-
-    result = await litellm_search_vector_store(params)
-    print(result[:400])
-    if len(result) > 400:
-        print(f"\n... (truncated)")
+    check_search_response(data, params.query, preview_chars=PREVIEW_CHARS)
 
 
 async def test_invalid_store():
-    """Test error handling for invalid vector store"""
-    print("\n" + "=" * 60)
-    print("TEST 5: Error Handling - Invalid Store Name")
-    print("=" * 60)
-
-    params = VectorStoreSearchInput(
+    """An unknown store name returns an error naming the store"""
+    params = VectorStoreSearchInput.model_construct(
         query="test query",
+        max_results=5,
+        response_format=ResponseFormat.JSON,
         vector_store="nonexistent-corpus",  # This doesn't exist
     )
+    data = ErrorResponse.model_validate_json(await litellm_search_vector_store(params))
+
+    assert "'nonexistent-corpus' not found" in data.error
+    assert "litellm_list_vector_stores" in data.error
+
+
+async def test_invalid_store_raises_in_core():
+    """In-process callers get the resolution failure as a ValueError"""
+    params = VectorStoreSearchInput.model_construct(
+        query="test query",
+        max_results=5,
+        response_format=ResponseFormat.JSON,
+        vector_store="nonexistent-corpus",
+    )
 
-    print(f"\n🔍 Searching 'nonexistent-corpus' (should fail)")
-    print("-" * 60)
-
-    try:
-        result = await litellm_search_vector_store(params)
-        print(result)
-    except Exception as e:
-        print(f"❌ Expected error occurred: {e}")
-
-
-async def main():
-    """Run all tests"""
-    print("\n")
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 10 + "MULTI-VECTOR STORE TEST SUITE" + " " * 18 + "║")
-    print("╚" + "=" * 58 + "╝")
-    print()
-
-    try:
-        await test_list_stores()
-        await test_search_by_name()
-        await test_search_by_id()
-        await test_search_default()
-        await test_invalid_store()
-
-        print("\n" + "=" * 60)
-        print("✅ ALL TESTS COMPLETED")
-        print("=" * 60)
-        print("\nThe MCP server now supports:")
-        print("  ✓ Listing all vector stores")
-        print("  ✓ Searching by friendly name")
-        print("  ✓ Searching by direct ID")
-        print("  ✓ Default fallback to env var")
-        print("  ✓ Helpful error messages")
-        print("\nReady for Claude Code integration! 🚀")
-
-    except Exception as e:
-        print(f"\n❌ Test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
+    with pytest.raises(ValueError, match="nonexistent-corpus"):
+        await _search_core(params)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the search pipeline
+
+The server's HTTP client is swapped for one backed by httpx.MockTransport,
+so these run without a LiteLLM server or credentials and cover:
+1. Exact-match result caching
+2. Semantic cache hits for paraphrased queries
+3. Falling back to a regular search when embedding fails
+4. Persisting embeddings to disk, and ignoring a damaged cache file
+5. Sharing one upstream request between concurrent identical searches
+6. Warming up and shutting down without leaving background tasks behind
+7. Serving a stale store catalogue while it refreshes in the background, and
+   dropping cached results for stores that changed
+8. Resolving store names missing from the cached catalogue, without refetching
+   it for every unknown name
+9. Keeping JSON responses within the character limit
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+import server
+from server import QueryCache, SemanticCache, EmbeddingCache, VectorStoreSearchInput
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+EMBEDDING_MODEL = "test-embedding"
+
+# Paraphrases point the same way; unrelated queries are orthogonal
+EMBEDDINGS = {
+    "Redis configuration": [1.0, 0.0, 0.0],
+    "How is Redis configured": [0.95, 0.1, 0.0],
+    "GKE cluster": [0.0, 1.0, 0.0],
+}
+
+
+class FakeLiteLLM:
+    """In-process stand-in for the LiteLLM API endpoints the server calls"""
+
+    def __init__(self) -> None:
+        self.stores = [{"vector_store_id": "1000", "vector_store_name": "internal-corpus"}]
+        self.list_requests = 0
+        self.searches: List[str] = []
+        self.embedding_requests: List[httpx.Request] = []
+        # Set to a Response or an exception to override the embedding endpoint
+        self.embedding_override: Optional[Any] = None
+        # When set, store list requests wait for this event before answering
+        self.list_gate: Optional[asyncio.Event] = None
+        # When set, searches wait for this event before answering
+        self.search_gate: Optional[asyncio.Event] = None
+        # Set to a Response to override the search endpoint
+        self.search_override: Optional[httpx.Response] = None
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/vector_store/list":
+            self.list_requests += 1
+            if self.list_gate is not None:
+                await self.list_gate.wait()
+            return httpx.Response(200, json={"data": self.stores, "total_pages": 1})
+
+        body: Dict[str, Any] = json.loads(request.content)
+        if request.url.path == "/v1/embeddings":
+            self.embedding_requests.append(request)
+            if isinstance(self.embedding_override, Exception):
+                raise self.embedding_override
+            if self.embedding_override is not None:
+                return self.embedding_override
+            return httpx.Response(
+                200, json={"data": [{"embedding": EMBEDDINGS[body["input"]]}]}
+            )
+
+        self.searches.append(body["query"])
+        if self.search_gate is not None:
+            await self.search_gate.wait()
+        if self.search_override is not None:
+            return self.search_override
+        return httpx.Response(
+            200,
+            json={
+                "data": [
+                    {
+                        "score": 0.9,
+                        "filename": "redis.tf",
+                        "file_id": "gs://corpus/redis.tf",
+                        "content": [{"type": "text", "text": f"Result for {body['query']}"}],
+                    }
+                ]
+            },
+        )
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> FakeLiteLLM:
+    """Point the server at a fresh FakeLiteLLM with empty caches"""
+    fake = FakeLiteLLM()
+    client = httpx.AsyncClient(
+        base_url="http://litellm.test", transport=httpx.MockTransport(fake.handle)
+    )
+    monkeypatch.setattr(server, "_HTTP_CLIENT", client)
+    monkeypatch.setattr(server, "EMBEDDING_MODEL", EMBEDDING_MODEL)
+    monkeypatch.setattr(server, "_RESULT_CACHE", QueryCache(max_size=16, ttl=300))
+    monkeypatch.setattr(
+        server, "_SEMANTIC_CACHE", SemanticCache(max_size=16, ttl=300, threshold=0.85)
+    )
+    monkeypatch.setattr(server, "_EMBEDDING_CACHE", EmbeddingCache(max_size=16, ttl=300))
+    monkeypatch.setattr(server, "_STORES_CACHE", None)
+    monkeypatch.setattr(server, "_STORES_REFRESH_TASK", None)
+    monkeypatch.setattr(server, "_INFLIGHT_SEARCHES", {})
+    return fake
+
+
+class FakeClock:
+    """Stands in for the time module inside server, with a settable monotonic clock"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    # Wall-clock time (used by the embedding cache) stays real
+    time = staticmethod(time.time)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Control the monotonic clock the server's caches see"""
+    fake = FakeClock()
+    monkeypatch.setattr(server, "time", fake)
+    return fake
+
+
+async def settle() -> None:
+    """Let every runnable task advance until it blocks"""
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+
+async def search(query: str, vector_store: Optional[str] = None) -> str:
+    """Run a Markdown search through the tool, by default of the default store"""
+    return await server.litellm_search_vector_store(
+        VectorStoreSearchInput(query=query, vector_store=vector_store)
+    )
+
+
+async def test_repeated_query_hits_result_cache(api: FakeLiteLLM):
+    """An identical query is answered without another search or embedding"""
+    first = await search("Redis configuration")
+    second = await search("Redis configuration")
+
+    assert second == first
+    assert api.searches == ["Redis configuration"]
+    assert len(api.embedding_requests) == 1
+    assert server._RESULT_CACHE.hits == 1
+
+
+async def test_paraphrase_hits_semantic_cache(api: FakeLiteLLM):
+    """A similar query reuses the earlier search's results"""
+    first = await search("Redis configuration")
+    second = await search("How is Redis configured")
+
+    assert api.searches == ["Redis configuration"]
+    assert server._SEMANTIC_CACHE.hits == 1
+    assert "Result for Redis configuration" in second
+    assert second.replace("How is Redis configured", "Redis configuration") == first
+
+
+async def test_unrelated_query_misses_semantic_cache(api: FakeLiteLLM):
+    """A dissimilar query runs its own search"""
+    await search("Redis configuration")
+    await search("GKE cluster")
+
+    assert api.searches == ["Redis configuration", "GKE cluster"]
+    assert server._SEMANTIC_CACHE.hits == 0
+
+
+async def test_semantic_hit_keeps_original_fetch_time(api: FakeLiteLLM, clock: FakeClock):
+    """Results reused for a paraphrase still expire one TTL after the fetch"""
+    await search("Redis configuration")
+    clock.now += 299
+    await search("How is Redis configured")  # Semantic hit, copied to the exact cache
+    clock.now += 290
+    await search("How is Redis configured")  # 589s after the fetch: must refetch
+
+    assert api.searches == ["Redis configuration", "How is Redis configured"]
+
+
+async def test_embedding_request_uses_short_timeout(api: FakeLiteLLM):
+    """The embedding call doesn't inherit the client's 30 second timeout"""
+    await search("Redis configuration")
+
+    timeout = api.embedding_requests[0].extensions["timeout"]
+    assert timeout["read"] == server.EMBEDDING_TIMEOUT
+
+
+async def test_concurrent_searches_share_one_request(api: FakeLiteLLM):
+    """Identical searches in flight together make a single upstream request"""
+    api.search_gate = asyncio.Event()
+    searches = [asyncio.create_task(search("Redis configuration")) for _ in range(5)]
+    await settle()
+    api.search_gate.set()
+    results = await asyncio.gather(*searches)
+
+    assert api.searches == ["Redis configuration"]
+    assert all(result == results[0] for result in results)
+    assert "Result for Redis configuration" in results[0]
+    assert server._INFLIGHT_SEARCHES == {}
+
+
+async def test_shared_search_error_reaches_every_caller(api: FakeLiteLLM):
+    """A failed shared request fails each caller waiting on it"""
+    api.search_gate = asyncio.Event()
+    api.search_override = httpx.Response(500, text="upstream error")
+    params = VectorStoreSearchInput(query="Redis configuration")
+    searches = [asyncio.create_task(server._search_core(params)) for _ in range(3)]
+    await settle()
+    api.search_gate.set()
+    outcomes = await asyncio.gather(*searches, return_exceptions=True)
+
+    assert api.searches == ["Redis configuration"]
+    assert all(isinstance(outcome, httpx.HTTPStatusError) for outcome in outcomes)
+    assert server._INFLIGHT_SEARCHES == {}
+
+
+async def test_cancelled_caller_leaves_shared_search_running(api: FakeLiteLLM):
+    """Cancelling one waiter doesn't cancel the request the others share"""
+    api.search_gate = asyncio.Event()
+    cancelled = asyncio.create_task(search("Redis configuration"))
+    waiting = asyncio.create_task(search("Redis configuration"))
+    await settle()
+    cancelled.cancel()
+    await settle()
+    api.search_gate.set()
+
+    assert "Result for Redis configuration" in await waiting
+    assert cancelled.cancelled()
+    assert api.searches == ["Redis configuration"]
+    assert server._INFLIGHT_SEARCHES == {}
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        httpx.Response(500, text="upstream error"),
+        httpx.Response(200, text="<html>not json</html>"),
+        httpx.Response(200, json={"data": []}),
+        httpx.Response(200, json={"data": [{"embedding": None}]}),
+        httpx.Response(200, json={"data": [{"embedding": ["a", "b"]}]}),
+        httpx.Response(200, json={"data": [{"embedding": [0.0, 0.0]}]}),
+        httpx.ReadTimeout("embedding timed out"),
+    ],
+    ids=["http-error", "non-json", "no-data", "null", "non-numeric", "zero-vector", "timeout"],
+)
+async def test_embedding_failure_falls_back_to_search(api: FakeLiteLLM, override: Any):
+    """A failed or malformed embedding still returns regular search results"""
+    api.embedding_override = override
+
+    result = await search("Redis configuration")
+
+    assert result.startswith("# Vector Store Search Results")
+    assert "Result for Redis configuration" in result
+    assert api.searches == ["Redis configuration"]
+    assert len(server._SEMANTIC_CACHE._entries) == 0
+
+
+async def test_embeddings_persist_across_restarts(
+    api: FakeLiteLLM, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    """A new cache on the same directory reuses stored embeddings"""
+    monkeypatch.setattr(
+        server, "_EMBEDDING_CACHE", EmbeddingCache(max_size=16, ttl=300, directory=str(tmp_path))
+    )
+    first = await server._embed_query("Redis configuration")
+
+    # Simulate a restart: fresh in-memory state, same directory
+    monkeypatch.setattr(
+        server, "_EMBEDDING_CACHE", EmbeddingCache(max_size=16, ttl=300, directory=str(tmp_path))
+    )
+    second = await server._embed_query("Redis configuration")
+
+    assert second == first
+    assert len(api.embedding_requests) == 1
+    assert server._EMBEDDING_CACHE.hits == 1
+
+    # Rows are keyed by a hash, so query text never reaches the disk
+    assert b"Redis configuration" not in (tmp_path / "embeddings.sqlite3").read_bytes()
+
+
+async def test_expired_embeddings_are_pruned(tmp_path: Path):
+    """Writing an entry deletes rows older than the TTL"""
+    cache = EmbeddingCache(max_size=16, ttl=300, directory=str(tmp_path))
+    cache._store((EMBEDDING_MODEL, "old query"), (0.0, [1.0]))
+    await cache.set(EMBEDDING_MODEL, "new query", [1.0])
+
+    with sqlite3.connect(tmp_path / "embeddings.sqlite3") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM embeddings").fetchone() == (1,)
+
+
+@pytest.mark.parametrize(
+    "damage", [b"", b"\0" * 100, b"not a database"], ids=["empty", "zeroed", "garbage"]
+)
+async def test_damaged_embedding_cache_is_ignored(
+    api: FakeLiteLLM, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, damage: bytes
+):
+    """An unreadable cache file counts as a miss instead of failing the search"""
+    (tmp_path / "embeddings.sqlite3").write_bytes(damage)
+    monkeypatch.setattr(
+        server, "_EMBEDDING_CACHE", EmbeddingCache(max_size=16, ttl=300, directory=str(tmp_path))
+    )
+
+    result = await search("Redis configuration")
+
+    assert "Result for Redis configuration" in result
+    assert len(api.embedding_requests) == 1
+
+
+async def test_damaged_embedding_row_is_ignored(api: FakeLiteLLM, tmp_path: Path):
+    """A row whose vector isn't valid JSON counts as a miss"""
+    cache = EmbeddingCache(max_size=16, ttl=300, directory=str(tmp_path))
+    await cache.set(EMBEDDING_MODEL, "Redis configuration", [1.0, 0.0, 0.0])
+    with sqlite3.connect(tmp_path / "embeddings.sqlite3") as conn:
+        conn.execute("UPDATE embeddings SET vector = 'not json'")
+
+    fresh = EmbeddingCache(max_size=16, ttl=300, directory=str(tmp_path))
+    assert await fresh.get(EMBEDDING_MODEL, "Redis configuration") is None
+
+
+async def test_warmup_ignores_malformed_catalogue(api: FakeLiteLLM):
+    """A catalogue the server can't parse doesn't fail the startup warmup"""
+    api.stores = [{"vector_store_name": "missing-id"}]
+
+    await server._warmup()
+
+    assert api.list_requests == 1
+    assert server._STORES_CACHE is None
+
+
+async def test_shutdown_cancels_pending_warmup(api: FakeLiteLLM):
+    """Leaving the lifespan stops a warmup still waiting on the catalogue"""
+    api.list_gate = asyncio.Event()
+
+    async with server._lifespan(server.mcp):
+        await settle()
+        (warmup,) = [
+            task for task in asyncio.all_tasks() if task.get_coro().__name__ == "_warmup"
+        ]
+
+    assert warmup.cancelled()
+    assert server._HTTP_CLIENT.is_closed
+
+
+async def test_shutdown_cancels_background_refresh(api: FakeLiteLLM, clock: FakeClock):
+    """Leaving the lifespan stops a stale-catalogue refresh before closing the client"""
+    await server._load_store_catalogue()
+    clock.now += server.STORES_CACHE_TTL
+    api.list_gate = asyncio.Event()
+
+    async with server._lifespan(server.mcp):
+        await settle()
+        refresh = server._STORES_REFRESH_TASK
+        assert refresh is not None and not refresh.done()
+
+    assert refresh.cancelled()
+    assert server._HTTP_CLIENT.is_closed
+
+
+async def test_stale_catalogue_is_served_while_refreshing(api: FakeLiteLLM, clock: FakeClock):
+    """Within twice the TTL, lookups get the old catalogue and one refresh starts"""
+    await server._load_store_catalogue()
+    api.stores.append({"vector_store_id": "2000", "vector_store_name": "new-corpus"})
+    clock.now += server.STORES_CACHE_TTL
+
+    _, name_to_id = await server._load_store_catalogue()
+    refresh = server._STORES_REFRESH_TASK
+    await server._load_store_catalogue()
+
+    assert "new-corpus" not in name_to_id
+    assert api.list_requests == 1
+    assert refresh is not None and server._STORES_REFRESH_TASK is refresh
+
+    await refresh
+    _, name_to_id = await server._load_store_catalogue()
+
+    assert name_to_id["new-corpus"] == "2000"
+    assert api.list_requests == 2
+
+
+async def test_expired_catalogue_waits_for_refresh(api: FakeLiteLLM, clock: FakeClock):
+    """Past twice the TTL, the stale catalogue is no longer served"""
+    await server._load_store_catalogue()
+    api.stores.append({"vector_store_id": "2000", "vector_store_name": "new-corpus"})
+    clock.now += 2 * server.STORES_CACHE_TTL
+
+    _, name_to_id = await server._load_store_catalogue()
+
+    assert name_to_id["new-corpus"] == "2000"
+    assert api.list_requests == 2
+    assert server._STORES_REFRESH_TASK is None
+
+
+async def test_updated_store_drops_its_cached_results(api: FakeLiteLLM, clock: FakeClock):
+    """A changed updated_at clears that store's exact and semantic cache entries"""
+    api.stores = [
+        {"vector_store_id": "1000", "vector_store_name": "internal-corpus", "updated_at": 1},
+        {"vector_store_id": "2000", "vector_store_name": "other-corpus", "updated_at": 1},
+    ]
+    await server._load_store_catalogue()
+    await search("Redis configuration", vector_store="1000")
+    await search("Redis configuration", vector_store="2000")
+
+    api.stores[0] = dict(api.stores[0], updated_at=2)
+    clock.now += 1
+    await server._refresh_store_catalogue()
+
+    assert [key[0] for key in server._RESULT_CACHE._entries] == ["2000"]
+    assert [entry[1] for entry in server._SEMANTIC_CACHE._entries] == ["2000"]
+
+
+async def test_removed_store_drops_its_cached_results(api: FakeLiteLLM, clock: FakeClock):
+    """A store missing from the refreshed catalogue has its entries cleared"""
+    await server._load_store_catalogue()
+    await search("Redis configuration", vector_store="1000")
+
+    api.stores = []
+    clock.now += 1
+    await server._refresh_store_catalogue()
+
+    assert len(server._RESULT_CACHE._entries) == 0
+    assert len(server._SEMANTIC_CACHE._entries) == 0
+
+
+async def test_new_store_resolves_before_catalogue_expires(api: FakeLiteLLM, clock: FakeClock):
+    """A name missing from a cached catalogue forces one refresh"""
+    await server._load_store_catalogue()
+    api.stores.append({"vector_store_id": "2000", "vector_store_name": "new-corpus"})
+    clock.now += server.STORES_MISS_REFRESH_INTERVAL
+
+    resolved = await server._resolve_vector_store_id("new-corpus")
+
+    assert resolved == "2000"
+    assert api.list_requests == 2
+
+
+async def test_unknown_store_refreshes_once_then_fails(api: FakeLiteLLM, clock: FakeClock):
+    """An unknown name is reported after a single refresh"""
+    await server._load_store_catalogue()
+    clock.now += server.STORES_MISS_REFRESH_INTERVAL
+
+    result = await search("Redis configuration", vector_store="nonexistent-corpus")
+
+    assert "Vector store 'nonexistent-corpus' not found" in result
+    assert "internal-corpus" in result
+    assert api.list_requests == 2
+    assert api.searches == []
+
+
+async def test_unknown_store_on_cold_cache_fetches_once(api: FakeLiteLLM):
+    """The catalogue fetched for the lookup isn't immediately fetched again"""
+    result = await search("Redis configuration", vector_store="nonexistent-corpus")
+
+    assert "Vector store 'nonexistent-corpus' not found" in result
+    assert api.list_requests == 1
+
+
+async def test_repeated_unknown_stores_share_one_refresh(api: FakeLiteLLM, clock: FakeClock):
+    """Misses soon after a refresh are answered from the catalogue just fetched"""
+    await server._load_store_catalogue()
+    clock.now += server.STORES_MISS_REFRESH_INTERVAL
+
+    for name in ["nonexistent-corpus", "internal-copus", "nonexistent-corpus"]:
+        with pytest.raises(ValueError, match=name):
+            await server._resolve_vector_store_id(name)
+
+    assert api.list_requests == 2
+
+
+@pytest.mark.parametrize("count,size", [(5, 100), (20, 3000)], ids=["fits", "over-limit"])
+async def test_json_results_stay_within_limit(count: int, size: int):
+    """Responses that fit are returned whole; larger ones drop results from the tail"""
+    data = [
+        {"score": 0.9, "filename": f"f{i}.py", "content": [{"type": "text", "text": "x" * size}]}
+        for i in range(count)
+    ]
+
+    formatted = server._format_json_results(data, "q")
+    response = json.loads(formatted)
+
+    assert len(formatted) <= server.CHARACTER_LIMIT
+    assert response == server._build_json_results(data, "q")
+    assert response["truncated"] == (response["total_results"] < count)
+    assert [r["filename"] for r in response["results"]] == [
+        f"f{i}.py" for i in range(response["total_results"])
+    ]